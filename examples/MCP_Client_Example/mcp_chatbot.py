@@ -2,17 +2,63 @@ import asyncio
 import json
 import os
 from contextlib import AsyncExitStack
+from operator import attrgetter
 
 import boto3
-import nest_asyncio
-from anthropic import AnthropicBedrock
+import botocore.session
+import httpx
+from anthropic import AnthropicBedrock, DefaultHttpxClient
+from botocore.credentials import JSONFileCache
 from dotenv import load_dotenv
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 
-nest_asyncio.apply()
 load_dotenv()
 
+_get_text = attrgetter('text')
+
+def bedrock_credentials():
+    """Return the AWS credentials for Bedrock, from a named profile, an assumed role or the environment"""
+    profile = os.getenv("AWS_BEDROCK_PROFILE")
+    if profile:
+        # Profile with role_arn/source_profile: botocore assumes the role and, sharing the AWS CLI cache,
+        # reuses the temporary credentials across runs until they expire
+        session = botocore.session.Session(profile=profile)
+        session.get_component('credential_provider').get_provider('assume-role').cache = JSONFileCache(
+            os.path.expanduser(os.path.join('~', '.aws', 'cli', 'cache'))
+        )
+        credentials = session.get_credentials().get_frozen_credentials()
+        return {
+            "aws_access_key": credentials.access_key,
+            "aws_secret_key": credentials.secret_key,
+            "aws_session_token": credentials.token,
+        }
+
+    if not os.getenv("AWS_ROLE_SWITCH"):
+        return {
+            "aws_access_key": os.getenv("AWS_ACCESS_KEY_ID"),
+            "aws_secret_key": os.getenv("AWS_SECRET_ACCESS_KEY"),
+            "aws_session_token": os.getenv("AWS_SESSION_TOKEN"),
+        }
+
+    sts_client = boto3.client(
+        "sts",
+        aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
+        aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
+        aws_session_token=os.getenv("AWS_SESSION_TOKEN")
+    )
+    # assume role with bedrock permissions, you will need to copy your ARN into the RoleArn field below
+    assumed_role = sts_client.assume_role(
+        RoleArn=os.getenv("AWS_ROLE_ARN"), RoleSessionName=os.getenv("AWS_ROLE_NAME")
+    )
+    # get bedrock role credentials
+    temp_credentials = assumed_role["Credentials"]
+    return {
+        "aws_access_key": temp_credentials["AccessKeyId"],
+        "aws_secret_key": temp_credentials["SecretAccessKey"],
+        "aws_session_token": temp_credentials["SessionToken"],
+    }
+
 
 class MCPChatBot:
     def __init__(self):
@@ -20,35 +66,19 @@ class MCPChatBot:
         self.history_file = "logs/chat_history.json"
         self.history = self.load_history()
 
-        if os.getenv("AWS_ROLE_SWITCH"):
-            sts_client = boto3.client(
-                "sts",
-                aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
-                aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
-                aws_session_token=os.getenv("AWS_SESSION_TOKEN")
-            )
-
-            # assume role with bedrock permissions, you will need to copy your ARN into the RoleArn field below
-            assumed_role = sts_client.assume_role(
-                RoleArn=os.getenv("AWS_ROLE_ARN"), RoleSessionName=os.getenv("AWS_ROLE_NAME")
-            )
-            # get bedrock role credentials
-            temp_credentials = assumed_role["Credentials"]
-            # create bedrock runtime
-            self.anthropic = AnthropicBedrock(
-                aws_access_key=temp_credentials["AccessKeyId"],
-                aws_secret_key=temp_credentials["SecretAccessKey"],
-                aws_session_token=temp_credentials["SessionToken"],
-                aws_region=os.getenv("AWS_REGION", 'us-east-1')
-            )
-        else:
-            self.anthropic = AnthropicBedrock(
-                aws_access_key=os.getenv("AWS_ACCESS_KEY_ID"),
-                aws_secret_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
-                aws_session_token=os.getenv("AWS_SESSION_TOKEN"),
-                aws_region=os.getenv("AWS_REGION", 'us-east-1')
+        self.anthropic = AnthropicBedrock(
+            **bedrock_credentials(),
+            aws_region=os.getenv("AWS_REGION", 'us-east-1'),
+            # Keep connections to Bedrock alive between turns and concurrent tool rounds
+            http_client=DefaultHttpxClient(
+                limits=httpx.Limits(max_connections=32, max_keepalive_connections=32, keepalive_expiry=60)
             )
+        )
 
+        # Cache the static tool definitions on Bedrock when the model supports prompt caching
+        self.prompt_caching = os.getenv("PROMPT_CACHING", "").lower() in ("1", "true", "yes")
+        # Input token counters reported by the API, to show how much was served from the cache
+        self.usage = {"input_tokens": 0, "cache_creation_input_tokens": 0, "cache_read_input_tokens": 0}
         # Tools list required for Anthropic API
         self.available_tools = []
         # Prompts list for quick display
@@ -73,7 +103,8 @@ class MCPChatBot:
         """Save chat history to file"""
         try:
             with open(self.history_file, 'w') as f:
-                json.dump(self.history, f, indent=2)
+                # Compact output; pretty-print on demand with `python -m json.tool logs/chat_history.json`
+                json.dump(self.history, f, separators=(',', ':'))
         except Exception as e:
             print(f"Error saving chat history: {e}")
 
@@ -90,9 +121,18 @@ class MCPChatBot:
             await session.initialize()
 
 
+            # List tools, prompts and resources concurrently over the same session
+            response, prompts_response, resources_response = await asyncio.gather(
+                session.list_tools(),
+                session.list_prompts(),
+                session.list_resources(),
+                return_exceptions=True
+            )
+
             try:
                 # List available tools
-                response = await session.list_tools()
+                if isinstance(response, Exception):
+                    raise response
                 for tool in response.tools:
                     self.sessions[tool.name] = session
                     self.available_tools.append({
@@ -102,7 +142,8 @@ class MCPChatBot:
                     })
 
                 # List available prompts
-                prompts_response = await session.list_prompts()
+                if isinstance(prompts_response, Exception):
+                    raise prompts_response
                 if prompts_response and prompts_response.prompts:
                     for prompt in prompts_response.prompts:
                         self.sessions[prompt.name] = session
@@ -112,7 +153,8 @@ class MCPChatBot:
                             "arguments": prompt.arguments
                         })
                 # List available resources
-                resources_response = await session.list_resources()
+                if isinstance(resources_response, Exception):
+                    raise resources_response
                 if resources_response and resources_response.resources:
                     for resource in resources_response.resources:
                         resource_uri = str(resource.uri)
@@ -131,10 +173,26 @@ class MCPChatBot:
             servers = data.get("mcpServers", {})
             for server_name, server_config in servers.items():
                 await self.connect_to_server(server_name, server_config)
+            # A checkpoint on the last tool caches the whole tool definitions block
+            if self.prompt_caching and self.available_tools:
+                self.available_tools[-1]["cache_control"] = {"type": "ephemeral"}
         except Exception as e:
             print(f"Error loading server config: {e}")
             raise
 
+    @staticmethod
+    def with_history_checkpoint(messages):
+        """Return a copy of messages with a cache checkpoint on the newest content block.
+
+        The stored messages are left untouched, so only the latest turn carries a checkpoint
+        and the request stays within Bedrock's limit on cache points.
+        """
+        if not messages:
+            return messages
+        last = messages[-1]
+        content = [*last['content'][:-1], {**last['content'][-1], 'cache_control': {'type': 'ephemeral'}}]
+        return [*messages[:-1], {**last, 'content': content}]
+
     async def process_query(self, query, previous_messages=None):
         # Include previous context if available
         messages = previous_messages or []
@@ -146,11 +204,13 @@ class MCPChatBot:
                 max_tokens = 2024,
                 model = 'anthropic.claude-3-5-sonnet-20240620-v1:0',
                 tools = self.available_tools,
-                messages = messages
+                messages = self.with_history_checkpoint(messages) if self.prompt_caching else messages
             )
+            for key in self.usage:
+                self.usage[key] += getattr(response.usage, key, None) or 0
 
             assistant_content = []
-            has_tool_use = False
+            tool_uses = []
 
             for content in response.content:
                 if content.type == 'text':
@@ -158,33 +218,42 @@ class MCPChatBot:
                     self.history.append({'role':'assistant', 'content':[{"type":"text","text":content.text}]})
                     assistant_content.append(content)
                 elif content.type == 'tool_use':
-                    has_tool_use = True
-
-                    # Get session and call tool
-                    session = self.sessions.get(content.name)
-                    if not session:
-                        print(f"Tool '{content.name}' not found.")
-                        break
-
-                    result = await session.call_tool(content.name, arguments=content.input)
-
-                    # Convert the result content to a string if it's a TextContent object
-                    result_content = result.content
-                    if hasattr(result_content, 'text'):
-                        result_content = result_content.text
-                    elif isinstance(result_content, list):
-                        result_content = [item.text if hasattr(item, 'text') else str(item) for item in result_content]
-
-                    messages.append({'role': 'assistant', 'content': [{'type':'tool_use', 'id': content.id, 'name': content.name, 'input': content.input}]})
-                    self.history.append({'role': 'assistant', 'content': [{'type':'tool_use', 'id': content.id, 'name': content.name, 'input': content.input}]})
-
-                    messages.append({'role': 'user', 'content': [{'type':'tool_result', 'tool_use_id': content.id, 'content': f"""{result_content}"""}]})
-                    self.history.append({'role': 'user', 'content': [{'type':'tool_result', 'tool_use_id': content.id, 'content': f"""{result_content}"""}]})
+                    tool_uses.append(content)
 
             # Exit loop if no tool was used
-            if not has_tool_use:
+            if not tool_uses:
+                break
+
+            missing = [content.name for content in tool_uses if content.name not in self.sessions]
+            if missing:
+                print(f"Tool '{missing[0]}' not found.")
                 break
 
+            # Run all the tool calls of this turn concurrently
+            results = await asyncio.gather(*(
+                self.sessions[content.name].call_tool(content.name, arguments=content.input)
+                for content in tool_uses
+            ))
+
+            tool_results = []
+            for content, result in zip(tool_uses, results):
+                # Convert the result content to a string if it's a TextContent object
+                result_content = result.content
+                if hasattr(result_content, 'text'):
+                    result_content = result_content.text
+                elif isinstance(result_content, list):
+                    try:
+                        result_content = "\n".join(map(_get_text, result_content))
+                    except AttributeError:
+                        result_content = "\n".join(item.text if hasattr(item, 'text') else str(item) for item in result_content)
+                tool_results.append({'type':'tool_result', 'tool_use_id': content.id, 'content': f"""{result_content}"""})
+
+            # One assistant turn with every tool_use, answered by one user turn with every tool_result
+            tool_use_message = {'role': 'assistant', 'content': [{'type':'tool_use', 'id': content.id, 'name': content.name, 'input': content.input} for content in tool_uses]}
+            tool_result_message = {'role': 'user', 'content': tool_results}
+            messages.extend([tool_use_message, tool_result_message])
+            self.history.extend([tool_use_message, tool_result_message])
+
     async def get_resource(self, resource_uri):
         session = self.sessions.get(resource_uri)
 
@@ -327,7 +396,20 @@ class MCPChatBot:
             except Exception as e:
                 print(f"\nError: {str(e)}")
 
+    def print_cache_usage(self):
+        """Print a summary of prompt cache usage for the session"""
+        total = sum(self.usage.values())
+        if not total:
+            return
+        print(f"\nInput tokens: {total} "
+              f"(cache read: {self.usage['cache_read_input_tokens']}, "
+              f"cache write: {self.usage['cache_creation_input_tokens']}, "
+              f"uncached: {self.usage['input_tokens']}) - "
+              f"cache hit rate {self.usage['cache_read_input_tokens'] / total:.1%}")
+
     async def cleanup(self):
+        if self.prompt_caching:
+            self.print_cache_usage()
         self.save_history()
         await self.exit_stack.aclose()
 
@@ -342,4 +424,9 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # Run on uvloop when it is installed, otherwise on asyncio
+    try:
+        from uvloop import run as run_loop
+    except ImportError:
+        from asyncio import run as run_loop
+    run_loop(main())
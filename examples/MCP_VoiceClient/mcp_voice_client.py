@@ -18,6 +18,18 @@ from langchain_mcp_adapters.tools import load_mcp_tools
 from langchain_mcp_adapters.prompts import load_mcp_prompt
 from smithy_aws_core.credentials_resolvers.environment import EnvironmentCredentialsResolver
 
+# Use orjson for the per-event JSON work when it is installed
+try:
+    import orjson
+
+    json_loads = orjson.loads
+
+    def json_dumps(obj):
+        return orjson.dumps(obj).decode('utf-8')
+except ImportError:
+    json_loads = json.loads
+    json_dumps = json.dumps
+
 # Suppress warnings
 warnings.filterwarnings("ignore")
 
@@ -35,6 +47,7 @@ CHUNK_SIZE = 1024  # Number of frames per buffer
 # Application constants
 DEBUG = False
 DEFAULT_MCP_SERVER_URL = "http://127.0.0.1:8001/mcp"
+MAX_TOOL_RESULT_ROWS = 50  # Rows of a tool result passed back to the model
 
 def debug_print(message):
     """Print debug message with timestamp and function name"""
@@ -61,6 +74,13 @@ async def time_it_async(label, method):
     debug_print(f"Execution time for {label}: {duration:.4f} seconds")
     return result
 
+def compact_tool_result(result):
+    """Trim long result lists so large query outputs do not bloat the model input"""
+    rows = result.get("results") if isinstance(result, dict) else None
+    if isinstance(rows, list) and len(rows) > MAX_TOOL_RESULT_ROWS:
+        result = {**result, "results": rows[:MAX_TOOL_RESULT_ROWS], "truncated_rows": len(rows) - MAX_TOOL_RESULT_ROWS}
+    return result
+
 # ============================================================================
 # PROFILE MANAGEMENT
 # ============================================================================
@@ -192,9 +212,9 @@ class ToolProcessor:
             raise ValueError("No MCP tools available")
 
         self.mcp_tools = {tool.name: tool for tool in loaded_tools}
-        self.tools_context = "\n\n".join([
+        self.tools_context = "\n\n".join(
             f"Tool: `{tool.name}`\nDescription: {tool.description}" for tool in loaded_tools
-        ])
+        )
         
         print("MCP session initialized:")
         if DEBUG:
@@ -233,7 +253,7 @@ class ToolProcessor:
         elif "content" in tool_content:
             raw = tool_content.get("content", "{}")
             try:
-                params = json.loads(raw)
+                params = json_loads(raw)
             except Exception as e:
                 debug_print(f"Could not parse string args: {e}")
                 params = {}
@@ -255,13 +275,13 @@ class ToolProcessor:
         # Normalize result types
         if isinstance(raw_result, str):
             try:
-                return json.loads(raw_result)
+                return json_loads(raw_result)
             except json.JSONDecodeError:
                 return {"result": raw_result}
         if isinstance(raw_result, list) and raw_result and hasattr(raw_result[0], 'text'):
             text = raw_result[0].text
             try:
-                return json.loads(text)
+                return json_loads(text)
             except Exception:
                 return {"result": text}
         if isinstance(raw_result, dict):
@@ -441,7 +461,7 @@ class BedrockStreamManager:
         """Create a tool result event"""
 
         if isinstance(content, dict):
-            content_json_string = json.dumps(content)
+            content_json_string = json_dumps(compact_tool_result(content))
         else:
             content_json_string = content
 
@@ -454,7 +474,7 @@ class BedrockStreamManager:
                 }
             }
         }
-        return json.dumps(tool_result_event)
+        return json_dumps(tool_result_event)
 
     def __init__(self, model_id='amazon.nova-sonic-v1:0', region='us-east-1', language='en', voice_id=None, mcp_server_url=DEFAULT_MCP_SERVER_URL, system_prompt=None, mcp_prompt=None, profile_system_prompt=None):
         """Initialize the stream manager."""
@@ -605,8 +625,6 @@ class BedrockStreamManager:
                 print("Using default system prompt")
             
             # Append current date and language steering
-            from datetime import datetime
-            import time
             current_datetime = datetime.now()
             current_date = current_datetime.strftime("%Y-%m-%d")
             current_time = current_datetime.strftime("%H:%M")
@@ -639,7 +657,6 @@ class BedrockStreamManager:
             debug_print(f"System prompt preview: {system_prompt[:200]}...")
             
             # Create text content event with proper JSON encoding
-            import json
             text_content_dict = {
                 "event": {
                     "textInput": {
@@ -654,7 +671,6 @@ class BedrockStreamManager:
             
             # Debug: Validate JSON format of text_content
             try:
-                import json
                 json.loads(text_content)
                 debug_print("Text content JSON is valid")
             except json.JSONDecodeError as e:
@@ -813,7 +829,7 @@ class BedrockStreamManager:
                     if result.value and result.value.bytes_:
                         try:
                             response_data = result.value.bytes_.decode('utf-8')
-                            json_data = json.loads(response_data)
+                            json_data = json_loads(response_data)
 
                             # Handle different response types
                             if 'event' in json_data:
@@ -827,7 +843,7 @@ class BedrockStreamManager:
                                     # Check for speculative content
                                     if 'additionalModelFields' in content_start:
                                         try:
-                                            additional_fields = json.loads(content_start['additionalModelFields'])
+                                            additional_fields = json_loads(content_start['additionalModelFields'])
                                             if additional_fields.get('generationStage') == 'SPECULATIVE':
                                                 debug_print("Speculative content detected")
                                                 self.display_assistant_text = True
@@ -1290,8 +1306,6 @@ if __name__ == "__main__":
     # Handle list tools request
     if args.list_tools:
         # We need to initialize the MCP connection to list tools
-        import asyncio
-        
         async def list_tools():
             try:
                 # Get MCP server URL from args or defaults
@@ -1331,9 +1345,15 @@ if __name__ == "__main__":
     # Get final configuration
     config = app_config.get_config(args)
     
+    # Run on uvloop when it is installed, otherwise on asyncio
+    try:
+        from uvloop import run as run_loop
+    except ImportError:
+        from asyncio import run as run_loop
+
     # Run the main function
     try:
-        asyncio.run(main(**config))
+        run_loop(main(**config))
     except Exception as e:
         print(f"Application error: {e}")
         if args.debug:
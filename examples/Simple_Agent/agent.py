@@ -4,10 +4,8 @@
 #  The followin video is a good overview of ADK and how to use it:
 #  https://www.youtube.com/watch?v=P4VFL9nIaIA
 
-import asyncio
 import os
 
-import nest_asyncio
 from dotenv import load_dotenv
 from google.adk.agents.llm_agent import LlmAgent
 from google.adk.models.lite_llm import LiteLlm
@@ -20,14 +18,27 @@ from google.adk.tools.mcp_tool.mcp_toolset import (
 )
 
 load_dotenv()
-nest_asyncio.apply()
 
-async def create_agent():
+# Agent instruction, built once at import and shared by every create_agent() call
+_INSTRUCTION = (
+    'Help user with Teradata tasks. '
+    'When you need several independent queries (e.g. previews, DDL or column descriptions of different tables), '
+    'run them together with the base_readQueryBatch tool rather than one base_readQuery call at a time.'
+)
+
+def create_agent():
     """Defines the transport mode to be used."""
 
-    if os.getenv("MCP_TRANSPORT") == 'stdio':
+    # streamable-http is the default: the toolset keeps one long-lived HTTP session to an already running
+    # server, shared by every tool call. stdio spawns a fresh `uv run teradata-mcp-server` subprocess (cold
+    # start, own DB pool) per connection and is meant for local development only.
+    transport = os.getenv("MCP_TRANSPORT") or 'streamable-http'
+    host = os.getenv("MCP_HOST", "localhost")
+    port = os.getenv("MCP_PORT", "8001")
+
+    builders = {
         # .env file needs to have MCP_TRANSPORT=stdio
-        connection_params=StdioConnectionParams(
+        'stdio': lambda: StdioConnectionParams(
             server_params=StdioServerParameters(
                 command='uv',
                 args=[
@@ -38,23 +49,22 @@ async def create_agent():
                 ],
             ),
             timeout=30  # Timeout in seconds for establishing the connection to the MCP std
-        )
-    elif os.getenv("MCP_TRANSPORT") == 'sse':
+        ),
         # .env file needs to have MCP_TRANSPORT=sse
-        connection_params=SseConnectionParams(
-            url = f'http://{os.getenv("MCP_HOST", "localhost")}:{os.getenv("MCP_PORT", 8001)}/sse',  # URL of the MCP server
+        'sse': lambda: SseConnectionParams(
+            url = f'http://{host}:{port}/sse',  # URL of the MCP server
             timeout=20,  # Timeout in seconds for establishing the connection to the MCP SSE server
-        )
-
-    elif os.getenv("MCP_TRANSPORT") == 'streamable-http':
-        # .env file needs to have MCP_TRANSPORT=streamable-http
-        connection_params=StreamableHTTPConnectionParams(
-            url = f'http://{os.getenv("MCP_HOST", "localhost")}:{os.getenv("MCP_PORT", 8001)}/mcp/',  # URL of the MCP server
+        ),
+        # default when MCP_TRANSPORT is not set
+        'streamable-http': lambda: StreamableHTTPConnectionParams(
+            url = f'http://{host}:{port}{os.getenv("MCP_PATH", "/mcp/")}',  # URL of the MCP server
             timeout=20,  # Timeout in seconds for establishing the connection to the MCP Streamable HTTP server
-        )
+        ),
+    }
 
-    else:
+    if transport not in builders:
         raise ValueError("MCP_TRANSPORT environment variable must be set to 'stdio', 'sse', or 'streamable-http'.")
+    connection_params = builders[transport]()
 
     toolset = MCPToolset(connection_params=connection_params)
 
@@ -87,12 +97,12 @@ async def create_agent():
     agent = LlmAgent(
         model=model,
         name='Simple_Agent',
-        instruction='Help user with Teradata tasks',
+        instruction=_INSTRUCTION,
         tools=[toolset]
     )
 
     return agent
 
-# Create the agent asynchronously
-root_agent = asyncio.run(create_agent())
+# Built once at import; adk picks up this module-level agent
+root_agent = create_agent()
 
@@ -13,14 +13,13 @@ try:
 except PackageNotFoundError:
     __version__ = "0.0.0"
 
-import asyncio
-
 from . import server
+from .utils import run
 
 
 def main():
     """Main entry point for the package."""
-    asyncio.run(server.main())
+    run(server.main())
 
 
 # Specify what’s available at package level
@@ -12,7 +12,6 @@ import re
 import signal
 import sys
 from typing import Any
-from dotenv import load_dotenv
 from mcp import types
 from mcp.server.fastmcp import FastMCP
 from mcp.server.fastmcp.prompts.base import TextContent, UserMessage
@@ -28,7 +27,7 @@ try:
 except ImportError:
     import tools as td
 
-load_dotenv()
+config.load_env()
 
 
 # Parse command line arguments - if any they will override environment variables
@@ -211,6 +210,7 @@ mcp = FastMCP("teradata-mcp-server")
 # Initialize global variables
 fs_config = None
 shutdown_in_progress = False
+shutdown_exit_code = 0
 
 # Now initialize the TD connection after module loader is ready
 _tdconn = td.TDConn()
@@ -742,46 +742,74 @@ async def main():
             logger.info(f"Registering signal handler for {s.name}")
             loop.add_signal_handler(s, lambda s=s: asyncio.create_task(shutdown(s)))
     except NotImplementedError:
-        # Windows doesn't support signals properly
-        logger.warning("Signal handling not supported on Windows")
+        # Windows has no loop.add_signal_handler: use signal.signal and hand the shutdown over to the loop
+        for s in signals:
+            logger.info(f"Registering fallback signal handler for {s.name}")
+            signal.signal(s, lambda signum, frame, s=s: loop.call_soon_threadsafe(asyncio.create_task, shutdown(s)))
 
     # Start the MCP server
-    if mcp_transport == "sse":
-        mcp.settings.host = os.getenv("MCP_HOST", "127.0.0.1")
-        mcp.settings.port = int(os.getenv("MCP_PORT", "8001"))
-        logger.info(f"Starting MCP server on {mcp.settings.host}:{mcp.settings.port}")
-        await mcp.run_sse_async()
-    elif mcp_transport == "streamable-http":
-        mcp.settings.host = os.getenv("MCP_HOST", "127.0.0.1")
-        mcp.settings.port = int(os.getenv("MCP_PORT", "8001"))
-        mcp.settings.streamable_http_path = os.getenv("MCP_PATH", "/mcp/")
-        logger.info(f"Starting MCP server on {mcp.settings.host}:{mcp.settings.port} with path {mcp.settings.streamable_http_path}")
-        await mcp.run_streamable_http_async()
-    else:
-        logger.info("Starting MCP server on stdin/stdout")
-        await mcp.run_stdio_async()
+    try:
+        if mcp_transport == "sse":
+            mcp.settings.host = os.getenv("MCP_HOST", "127.0.0.1")
+            mcp.settings.port = int(os.getenv("MCP_PORT", "8001"))
+            logger.info(f"Starting MCP server on {mcp.settings.host}:{mcp.settings.port}")
+            await mcp.run_sse_async()
+        elif mcp_transport == "streamable-http":
+            mcp.settings.host = os.getenv("MCP_HOST", "127.0.0.1")
+            mcp.settings.port = int(os.getenv("MCP_PORT", "8001"))
+            mcp.settings.streamable_http_path = os.getenv("MCP_PATH", "/mcp/")
+            logger.info(f"Starting MCP server on {mcp.settings.host}:{mcp.settings.port} with path {mcp.settings.streamable_http_path}")
+            await mcp.run_streamable_http_async()
+        else:
+            logger.info("Starting MCP server on stdin/stdout")
+            await mcp.run_stdio_async()
+    except asyncio.CancelledError:
+        # Cancelled by shutdown(), anything else is propagated
+        if not shutdown_in_progress:
+            raise
+    finally:
+        # Close pooled Teradata sessions once in-flight requests have unwound
+        _tdconn.close()
+
+    if shutdown_in_progress:
+        sys.exit(shutdown_exit_code)
 
 #------------------ Shutdown ------------------#
 # Shutdown function to handle cleanup and exit
 #     Arguments: sig (signal.Signals) - signal received for shutdown
-#     Description: Cleans up resources and exits the server gracefully.
+#     Description: Stops the server gracefully.
 #         It sets a flag to indicate that shutdown is in progress and logs the received signal.
-#         If the shutdown is already in progress, it forces an immediate exit.
-#         The function uses os._exit to terminate the process with a specific exit code.
+#         It cancels the running server and request tasks, main() then closes the connection pool and exits
+#         with code 128 + signal number.
+#         If the tasks do not unwind within SHUTDOWN_TIMEOUT seconds (e.g. stdio blocked on reading stdin),
+#         or a second signal is received, it closes the pool and forces an immediate exit with os._exit.
+SHUTDOWN_TIMEOUT = 5
+
 async def shutdown(sig=None):
     """Clean shutdown of the server."""
-    global shutdown_in_progress, _tdconn
+    global shutdown_in_progress, shutdown_exit_code, _tdconn
 
     logger.info("Shutting down server")
     if shutdown_in_progress:
         logger.info("Forcing immediate exit")
         os._exit(1)  # Use immediate process termination instead of sys.exit
 
-    _tdconn.close()
     shutdown_in_progress = True
+    shutdown_exit_code = 128 + sig if sig is not None else 0
     if sig:
         logger.info(f"Received exit signal {sig.name}")
-    os._exit(128 + sig if sig is not None else 0)
+
+    tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+    for task in tasks:
+        task.cancel()
+    if not tasks:
+        return
+
+    _, pending = await asyncio.wait(tasks, timeout=SHUTDOWN_TIMEOUT)
+    if pending:
+        logger.warning(f"{len(pending)} task(s) still running after {SHUTDOWN_TIMEOUT}s, forcing exit")
+        _tdconn.close()
+        os._exit(shutdown_exit_code)
 
 
 #------------------ Entry Point ------------------#
@@ -791,4 +819,4 @@ async def shutdown(sig=None):
 #         The main function is called to start the server and handle incoming requests.
 #         If an error occurs during execution, it logs the error and exits with a non-zero status code.
 if __name__ == "__main__":
-    asyncio.run(main())
+    config.run(main())
@@ -9,6 +9,27 @@ from teradata_mcp_server.tools.utils import create_response, rows_to_json
 
 logger = logging.getLogger("teradata_mcp_server")
 
+# Leading keyword of a statement we are willing to send to the database, after optional comments and parentheses.
+# Anything else (empty text, a placeholder such as "all", free text) is rejected locally without a round trip.
+_SQL_STATEMENT_RE = re.compile(
+    r"^\s*(?:(?:--[^\n]*(?:\n|$)|/\*.*?\*/)\s*)*\(*\s*"
+    r"(select|sel|with|insert|ins|update|upd|delete|del|merge|show|help|explain|create|replace|drop|alter"
+    r"|rename|grant|revoke|locking|lock|exec|execute|call|collect|database|comment|begin|end|bt|et"
+    r"|abort|rollback|commit|set)\b",
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+def _column_metadata(cursor) -> list[dict]:
+    """Name and type of each result column, as reported in the read query tools' metadata."""
+    return [
+        {
+            "name": col[0],
+            "type": getattr(col[1], "__name__", str(col[1]))
+        }
+        for col in (cursor.description or [])
+    ]
+
 #------------------ Tool  ------------------#
 # Read query tool
 def handle_base_readQuery(
@@ -29,6 +50,13 @@ def handle_base_readQuery(
     """
     logger.debug(f"Tool: handle_base_readQuery: Args: sql: {sql}, args={args!r}, kwargs={kwargs!r}")
 
+    # 0. Reject missing or malformed SQL before it reaches the database
+    if not sql or not _SQL_STATEMENT_RE.match(sql):
+        return create_response(
+            {"error": "No valid SQL statement provided."},
+            {"tool_name": tool_name if tool_name else "base_readQuery", "sql": sql},
+        )
+
     # 1. Build a textual SQL statement
     stmt = text(sql)
 
@@ -39,13 +67,7 @@ def handle_base_readQuery(
     cursor = result.cursor  # underlying DB-API cursor
     raw_rows = cursor.fetchall() or []
     data = rows_to_json(cursor.description, raw_rows)
-    columns = [
-        {
-            "name": col[0],
-            "type": getattr(col[1], "__name__", str(col[1]))
-        }
-        for col in (cursor.description or [])
-    ]
+    columns = _column_metadata(cursor)
 
     # 4. Compile the statement with literal binds for “final SQL”
     #    Fallback to DefaultDialect if conn has no `.dialect`
@@ -67,6 +89,61 @@ def handle_base_readQuery(
     return create_response(data, metadata)
 
 
+#------------------ Tool  ------------------#
+# Batched read query tool
+def handle_base_readQueryBatch(
+    conn: Connection,
+    sqls: list[str] | None = None,
+    *args,
+    **kwargs
+):
+    """
+    Execute several independent SQL queries in a single call, on one database connection, and return each result set in order.
+    Prefer this over successive base_readQuery calls when the queries do not depend on each other's results.
+
+    Arguments:
+      sqls - list of SQL statements to run, in order
+
+    Returns:
+      ResponseType: formatted response with one entry per query (columns and rows, or error) + metadata listing failed queries
+    """
+    logger.debug(f"Tool: handle_base_readQueryBatch: Args: sqls: {sqls}")
+
+    if not sqls:
+        return create_response(
+            {"error": "No SQL statements provided."},
+            {"tool_name": "base_readQueryBatch", "sqls": sqls},
+        )
+
+    data = []
+    for sql in sqls:
+        # Same local check as base_readQuery, reported in place so the other queries still run
+        if not sql or not _SQL_STATEMENT_RE.match(sql):
+            data.append({"sql": sql, "error": "No valid SQL statement provided."})
+            continue
+        try:
+            result = conn.execute(text(sql))
+            cursor = result.cursor
+            rows = rows_to_json(cursor.description, cursor.fetchall())
+            data.append({"sql": sql, "columns": _column_metadata(cursor), "row_count": len(rows), "results": rows})
+        except Exception as e:
+            # Keep going with the remaining queries, the failed statement is reported in place
+            logger.error(f"Tool: handle_base_readQueryBatch: query failed: {e}")
+            conn.rollback()
+            data.append({"sql": sql, "error": str(e)})
+
+    # Batch-level summary, so callers see a partial failure without walking every entry
+    errors = [{"index": i, "sql": d["sql"], "error": d["error"]} for i, d in enumerate(data) if "error" in d]
+    metadata = {
+        "tool_name": "base_readQueryBatch",
+        "query_count": len(data),
+        "failed_count": len(errors),
+        "errors": errors,
+    }
+    logger.debug(f"Tool: handle_base_readQueryBatch: metadata: {metadata}")
+    return create_response(data, metadata)
+
+
 #------------------ Tool  ------------------#
 # List databases tool
 def handle_base_databaseList(conn: TeradataConnection, *args, **kwargs):
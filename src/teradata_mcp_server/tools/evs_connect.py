@@ -4,13 +4,14 @@ import os
 from functools import lru_cache
 from urllib.parse import urlparse
 
-from dotenv import load_dotenv
 from teradatagenai import VectorStore, VSManager
 from teradataml import create_context, get_context, set_auth_token
 
+from teradata_mcp_server.utils import load_env
+
 from .td_connect import TDConn
 
-load_dotenv()
+load_env()
 
 logger = logging.getLogger("evs_connect")
 
@@ -6,14 +6,32 @@ Configuration loading utilities:
 """
 
 import logging
+from collections.abc import Coroutine
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any, Optional
 from importlib.resources import files as pkg_files
 import yaml
+from dotenv import load_dotenv
 
 logger = logging.getLogger("teradata_mcp_server")
 
 
+@lru_cache(maxsize=1)
+def load_env() -> bool:
+    """Load the .env file into the environment, only once per process."""
+    return load_dotenv()
+
+
+def run(main: Coroutine[Any, Any, Any]) -> Any:
+    """Run the entry-point coroutine on uvloop when it is installed (`perf` extra), otherwise on asyncio."""
+    try:
+        from uvloop import run as run_loop
+    except ImportError:
+        from asyncio import run as run_loop
+    return run_loop(main)
+
+
 def load_profiles(working_dir: Optional[Path] = None) -> Dict[str, Any]:
     """Load packaged profiles.yml, then working directory profiles.yml (overrides)."""
     if working_dir is None:
@@ -9,10 +9,11 @@ This script:
 4. Reports pass/fail based on response payload
 """
 
+import argparse
 import asyncio
+import hashlib
 import json
 import os
-import subprocess
 import sys
 import time
 from contextlib import AsyncExitStack
@@ -22,43 +23,140 @@ from datetime import datetime
 from mcp.client.session import ClientSession
 from mcp.client.stdio import StdioServerParameters, stdio_client
 
+# Parse tool responses and write reports with orjson when it is installed (its errors subclass json.JSONDecodeError)
+try:
+    import orjson
+    from orjson import loads as json_loads
+except ImportError:
+    orjson = None
+    from json import loads as json_loads
+
+# ijson is only needed for --stream-parse
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Seconds allowed for the server to start and complete the MCP handshake
+INITIALIZE_TIMEOUT = 20
+
+
+class Utf8Reader:
+    """Binary file-like view of a str that encodes only the slice being read, so ijson never needs a full byte copy."""
+
+    def __init__(self, text: str):
+        self._text = text
+        self._pos = 0
+
+    def read(self, size: int = -1) -> bytes:
+        end = len(self._text) if size < 0 else self._pos + size
+        chunk = self._text[self._pos:end]
+        self._pos += len(chunk)
+        return chunk.encode()
+
+
+def scan_response(response_text: str) -> tuple[str, bool, str | None, bool]:
+    """Stream a tool response and return (status, has_error, error, empty) without building the results object."""
+    status, has_error, error, empty = "", False, None, True
+    try:
+        for prefix, event, value in ijson.parse(Utf8Reader(response_text)):
+            if prefix == "status" and event == "string":
+                status = value.lower()
+            elif prefix == "results":
+                if event == "map_key":
+                    empty = False
+                    has_error = has_error or value == "error"
+                elif event not in ("start_map", "end_map", "start_array", "end_array"):
+                    empty = not value
+            elif prefix == "results.item":
+                empty = False
+            elif prefix == "results.error" and event in ("string", "number", "boolean"):
+                error = str(value)
+    except ijson.JSONError as e:
+        raise json.JSONDecodeError(str(e), response_text, 0) from e
+    return status, has_error, error, empty
+
+
+def write_report(results_file: str, detailed_results: dict, pretty: bool = False):
+    """Serialize the detailed results to the report file, compact unless pretty is set."""
+    if orjson is not None:
+        with open(results_file, 'wb') as f:
+            f.write(orjson.dumps(detailed_results, option=orjson.OPT_INDENT_2 if pretty else None))
+    else:
+        with open(results_file, 'w') as f:
+            if pretty:
+                json.dump(detailed_results, f, indent=2)
+            else:
+                json.dump(detailed_results, f, separators=(',', ':'))
+
 
 class MCPTestRunner:
-    def __init__(self, test_cases_files: list[str] = ["tests/cases/core_test_cases.json"], verbose: bool = False):
+    def __init__(self, test_cases_files: list[str] = ["tests/cases/core_test_cases.json"], verbose: bool = False,
+                 *, concurrency: int = 1, cache_idempotent: bool = False, stream_parse: bool = False,
+                 pretty_report: bool = False):
         self.test_cases_files = test_cases_files if isinstance(test_cases_files, list) else [test_cases_files]
         self.test_cases: dict[str, list[dict]] = {}
         self.scripts: dict[str, dict] = {"pre_test": [], "post_test": []}
+        # Per-tool call timeouts in seconds, from the "timeouts" section of the case files
+        self.tool_timeouts: dict[str, float] = {}
         self.available_tools: list[str] = []
+        self.available_tools_set: set[str] = set()
         self.results: list[dict] = []
         self.session: ClientSession | None = None
         self.exit_stack: AsyncExitStack | None = None
         self.verbose = verbose
+        self.concurrency = max(1, concurrency)
+        # Calls of cases marked "idempotent", keyed by tool name and parameters; identical cases await the same task
+        self.cache_idempotent = cache_idempotent
+        self._call_cache: dict[str, asyncio.Task] = {}
+        self._project_root: str | None = None
+        self.pretty_report = pretty_report
+        # Environment snapshot shared by the server process and the pre/post-test scripts
+        self._base_env = dict(os.environ)
+        # Scan responses with ijson instead of loading them whole
+        self.stream_parse = stream_parse and ijson is not None
+        if stream_parse and ijson is None:
+            print("⚠ ijson is not installed, --stream-parse is ignored")
 
     def _find_project_root(self) -> str:
-        """Find the project root directory (contains profiles.yml)."""
-        current = os.path.abspath(os.getcwd())
-        while current != '/':
-            if os.path.exists(os.path.join(current, 'profiles.yml')):
-                return current
-            current = os.path.dirname(current)
-        return os.getcwd()
+        """Find the project root directory (contains profiles.yml), walking the tree only once."""
+        if self._project_root is None:
+            current = os.path.abspath(os.getcwd())
+            while current != '/':
+                if os.path.exists(os.path.join(current, 'profiles.yml')):
+                    break
+                current = os.path.dirname(current)
+            else:
+                current = os.getcwd()
+            self._project_root = current
+        return self._project_root
 
     async def load_test_cases(self):
-        """Load test cases from JSON files."""
+        """Load test cases from JSON files, skipping cases repeated across files."""
+        # (name, parameters) signatures already loaded, per tool
+        seen: dict[str, set[tuple[str, str]]] = {}
+        duplicates = 0
         try:
             for test_cases_file in self.test_cases_files:
                 if os.path.exists(test_cases_file):
-                    with open(test_cases_file) as f:
-                        data = json.load(f)
+                    with open(test_cases_file, 'rb') as f:
+                        data = json_loads(f.read())
                         file_test_cases = data.get('test_cases', {})
                         file_scripts = data.get('scripts', {})
+                        self.tool_timeouts.update(data.get('timeouts', {}))
 
                         # Merge test cases from this file
                         for tool_name, cases in file_test_cases.items():
-                            if tool_name in self.test_cases:
-                                self.test_cases[tool_name].extend(cases)
-                            else:
-                                self.test_cases[tool_name] = cases
+                            tool_cases = self.test_cases.setdefault(tool_name, [])
+                            tool_seen = seen.setdefault(tool_name, set())
+                            for case in cases:
+                                signature = (case.get('name', ''),
+                                             json.dumps(case.get('parameters', {}), sort_keys=True, default=str))
+                                if signature in tool_seen:
+                                    duplicates += 1
+                                    continue
+                                tool_seen.add(signature)
+                                tool_cases.append(case)
 
                         # Merge scripts from this file
                         for script_type in ['pre_test', 'post_test']:
@@ -76,6 +174,8 @@ class MCPTestRunner:
                 else:
                     print(f"⚠ Test cases file not found: {test_cases_file}")
 
+            if duplicates:
+                print(f"⚠ Skipped {duplicates} duplicate cases")
             print(f"✓ Total test cases loaded for {len(self.test_cases)} tools")
         except Exception as e:
             print(f"✗ Failed to load test cases: {e}")
@@ -95,9 +195,9 @@ class MCPTestRunner:
                 sys.exit(1)
 
             env_vars = {
-                **os.environ,
+                **self._base_env,
                 "MCP_TRANSPORT": "stdio",
-                "PYTHONPATH": os.environ.get("PYTHONPATH", ""),
+                "PYTHONPATH": self._base_env.get("PYTHONPATH", ""),
                 # Show server logs during startup for debugging
                 "LOGGING_LEVEL": "INFO" if self.verbose else "WARNING"
             }
@@ -125,24 +225,12 @@ class MCPTestRunner:
             )
 
             print("  Initializing MCP protocol...")
-            # Try multiple times with increasing timeouts
-            max_retries = 3
-            timeout_seconds = [5, 10, 15]
-
-            for attempt in range(max_retries):
-                try:
-                    await asyncio.wait_for(self.session.initialize(), timeout=timeout_seconds[attempt])
-                    print("✓ Connected to MCP server")
-                    return
-                except TimeoutError:
-                    if attempt < max_retries - 1:
-                        print(f"  Initialization timeout ({timeout_seconds[attempt]}s), retrying... (attempt {attempt + 1}/{max_retries})")
-                        await asyncio.sleep(1)  # Brief pause before retry
-                    else:
-                        raise
+            # A single handshake with one overall deadline: the server answers once it has started
+            await asyncio.wait_for(self.session.initialize(), timeout=INITIALIZE_TIMEOUT)
+            print("✓ Connected to MCP server")
 
         except TimeoutError:
-            print("✗ Failed to connect to MCP server: Initialization timeout")
+            print(f"✗ Failed to connect to MCP server: Initialization timeout ({INITIALIZE_TIMEOUT}s)")
             print("  The server may be taking longer to start. Try:")
             print("  1. Check if the server command is correct")
             print("  2. Verify DATABASE_URI is accessible")
@@ -164,6 +252,7 @@ class MCPTestRunner:
 
             response = await self.session.list_tools()
             self.available_tools = [tool.name for tool in response.tools]
+            self.available_tools_set = set(self.available_tools)
             print(f"✓ Discovered {len(self.available_tools)} available tools")
 
             # Show which test cases we can run
@@ -175,7 +264,7 @@ class MCPTestRunner:
 
             # Show which test cases we can run
             if len(testable_tools) < len(self.available_tools):
-                missing_tools = set(self.available_tools) - set(testable_tools)
+                missing_tools = self.available_tools_set.difference(testable_tools)
                 print(f"⚠ Tools without tests: {', '.join(sorted(missing_tools))}")
 
         except Exception as e:
@@ -200,33 +289,39 @@ class MCPTestRunner:
                 print(f"    Command: {command}")
 
             try:
-                # Run the command and capture output
-                result = subprocess.run(
+                # Run the command without blocking the event loop and capture output
+                process = await asyncio.create_subprocess_shell(
                     command,
-                    check=False, shell=True,
-                    capture_output=True,
-                    text=True,
-                    timeout=300,  # 5 minute timeout
-                    env={**os.environ}  # Pass current environment including DATABASE_URI
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    env=self._base_env  # Pass current environment including DATABASE_URI
                 )
+                try:
+                    stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=300)  # 5 minute timeout
+                except TimeoutError:
+                    process.kill()
+                    await process.wait()
+                    raise
+                stdout = stdout.decode(errors='replace').strip()
+                stderr = stderr.decode(errors='replace').strip()
 
-                if result.returncode == 0:
+                if process.returncode == 0:
                     print("  ✓ Script completed successfully")
-                    if self.verbose and result.stdout.strip():
-                        print(f"    Output: {result.stdout.strip()}")
+                    if self.verbose and stdout:
+                        print(f"    Output: {stdout}")
                 else:
-                    print(f"  ✗ Script failed with exit code {result.returncode}")
-                    if result.stderr.strip():
-                        print(f"    Error: {result.stderr.strip()}")
-                    if self.verbose and result.stdout.strip():
-                        print(f"    Output: {result.stdout.strip()}")
+                    print(f"  ✗ Script failed with exit code {process.returncode}")
+                    if stderr:
+                        print(f"    Error: {stderr}")
+                    if self.verbose and stdout:
+                        print(f"    Output: {stdout}")
 
                     # For pre-test scripts, exit on failure
                     if script_type == 'pre_test':
                         print("✗ Pre-test script failure, aborting test run")
                         sys.exit(1)
 
-            except subprocess.TimeoutExpired:
+            except TimeoutError:
                 print("  ✗ Script timed out after 5 minutes")
                 if script_type == 'pre_test':
                     print("✗ Pre-test script timeout, aborting test run")
@@ -238,17 +333,52 @@ class MCPTestRunner:
                     sys.exit(1)
 
     async def run_test_case(self, tool_name: str, test_case: dict) -> dict:
-        """Run a single test case."""
+        """Run a single test case, sharing the call of an identical idempotent case when caching is enabled."""
+        if not (self.cache_idempotent and test_case.get('idempotent')):
+            return await self._execute_test_case(tool_name, test_case)
+
+        cache_key = hashlib.sha256(json.dumps(
+            {"tool": tool_name, "parameters": test_case.get('parameters', {})}, sort_keys=True, default=str
+        ).encode()).hexdigest()
+        while True:
+            task = self._call_cache.get(cache_key)
+            if task is None:
+                # First case making this call; identical cases started meanwhile await the same task
+                task = asyncio.ensure_future(self._execute_test_case(tool_name, test_case))
+                self._call_cache[cache_key] = task
+                return await task
+
+            result = await task
+            if result['status'] == 'PASS':
+                print(f"  Running {tool_name}:{test_case['name']}... {result['status']} (cached)")
+                return {**result, "test": test_case['name'], "duration": 0.0, "cached": True}
+
+            # Only successful responses are reused: forget the failed call and make this case's own
+            if self._call_cache.get(cache_key) is task:
+                del self._call_cache[cache_key]
+
+    def _test_timeout(self, tool_name: str, test_case: dict) -> tuple[float | None, str | None]:
+        """Return the call timeout of a test case and where it was set: the case, the tool table, or nowhere."""
+        if test_case.get('timeout') is not None:
+            return test_case['timeout'], "case"
+        if tool_name in self.tool_timeouts:
+            return self.tool_timeouts[tool_name], "tool"
+        return None, None
+
+    async def _execute_test_case(self, tool_name: str, test_case: dict) -> dict:
+        """Call the tool for a test case and evaluate the response."""
         test_name = f"{tool_name}:{test_case['name']}"
+        timeout, timeout_source = self._test_timeout(tool_name, test_case)
         start_time = time.time()
 
-        print(f"  Running {test_name}...", end=" ")
-        sys.stdout.flush()  # Force flush to ensure clean output
-
+        # Progress is printed as one line once the call completes, so concurrent cases do not interleave
         try:
-            response = await self.session.call_tool(
-                name=tool_name,
-                arguments=test_case.get('parameters', {})
+            response = await asyncio.wait_for(
+                self.session.call_tool(
+                    name=tool_name,
+                    arguments=test_case.get('parameters', {})
+                ),
+                timeout=timeout
             )
 
             duration = time.time() - start_time
@@ -257,42 +387,43 @@ class MCPTestRunner:
             if hasattr(response, 'content') and response.content:
                 try:
                     # Extract text content from MCP response
-                    response_text = ""
                     if isinstance(response.content, list):
-                        for content_item in response.content:
-                            if hasattr(content_item, 'text'):
-                                response_text += content_item.text
+                        response_text = "".join(item.text for item in response.content if hasattr(item, 'text'))
                     else:
                         response_text = str(response.content)
 
                     # Parse JSON response
-                    response_json = json.loads(response_text)
-
-                    # Check success criteria: status = "success" AND no "error" key in results
-                    response_status = response_json.get("status", "").lower()
-                    results = response_json.get("results", {})
+                    if self.stream_parse:
+                        response_status, has_results_error, results_error, results_empty = scan_response(response_text)
+                    else:
+                        response_json = json_loads(response_text)
+                        response_status = response_json.get("status", "").lower()
+                        results = response_json.get("results", {})
+                        has_results_error = isinstance(results, dict) and "error" in results
+                        results_error = results["error"] if has_results_error else None
+                        results_empty = not results
+                    # The response text is already at hand; no need to stringify the parsed results again
+                    results_length = len(response_text)
 
                     # Initialize variables
                     has_warning = False
 
-                    # Determine if test passed
-                    if response_status == "success" and (not isinstance(results, dict) or "error" not in results):
+                    # Check success criteria: status = "success" AND no "error" key in results
+                    if response_status == "success" and not has_results_error:
                         status = "PASS"
                         error_msg = None
 
                         # Check for empty results and log warning
-                        results_length = len(str(results)) if results else 0
-                        if results_length == 0 or (isinstance(results, list | dict) and len(results) == 0):
-                            has_warning = True
+                        has_warning = results_empty
                     else:
                         status = "FAIL"
-                        if isinstance(results, dict) and "error" in results:
-                            error_msg = results["error"]
+                        # The report prints the first line of the error, so it must always be a string
+                        if has_results_error and results_error is not None:
+                            error_msg = str(results_error)
                         else:
                             error_msg = f"Status: {response_status}"
-                        results_length = len(str(results)) if results else 0
 
-                    print(f"{'⚠' if has_warning else ''}{status} ({duration:.2f}s)")
+                    print(f"  Running {test_name}... {'⚠' if has_warning else ''}{status} ({duration:.2f}s)")
 
                     # Show full response in verbose mode for failures or errors
                     if self.verbose and status == "FAIL":
@@ -306,14 +437,16 @@ class MCPTestRunner:
                         "response_length": results_length,
                         "error": error_msg,
                         "response_status": response_status,
-                        "has_error_in_results": isinstance(results, dict) and "error" in results,
-                        "full_response": response_text,  # Always store full response
+                        "has_error_in_results": has_results_error,
+                        # Keep the full response only where the report prints it; passing ones are fingerprinted
+                        "full_response": response_text if status == "FAIL" else None,
+                        "response_sha256": hashlib.sha256(response_text.encode()).hexdigest()[:16] if status == "PASS" else None,
                         "has_warning": has_warning if status == "PASS" else False
                     }
 
                 except json.JSONDecodeError as e:
                     # Fallback for non-JSON responses - these are typically server errors
-                    print(f"FAIL (server error) ({duration:.2f}s)")
+                    print(f"  Running {test_name}... FAIL (server error) ({duration:.2f}s)")
                     if self.verbose:
                         print(f"    JSON parse error: {e}")
                         print(f"    Server response: {response_text}")
@@ -332,7 +465,7 @@ class MCPTestRunner:
                         "response_status": "server_error"
                     }
             else:
-                print(f"FAIL (no content) ({duration:.2f}s)")
+                print(f"  Running {test_name}... FAIL (no content) ({duration:.2f}s)")
                 return {
                     "tool": tool_name,
                     "test": test_case['name'],
@@ -342,9 +475,24 @@ class MCPTestRunner:
                     "error": "No content in response"
                 }
 
+        except TimeoutError:
+            duration = time.time() - start_time
+            print(f"  Running {test_name}... FAIL (timeout) ({duration:.2f}s)")
+            error_msg = f"Timed out after {timeout}s ({timeout_source} timeout)"
+            return {
+                "tool": tool_name,
+                "test": test_case['name'],
+                "status": "FAIL",
+                "duration": duration,
+                "response_length": 0,
+                "error": error_msg,
+                "timeout_source": timeout_source,
+                "full_response": error_msg
+            }
+
         except Exception as e:
             duration = time.time() - start_time
-            print(f"FAIL (exception) ({duration:.2f}s)")
+            print(f"  Running {test_name}... FAIL (exception) ({duration:.2f}s)")
             return {
                 "tool": tool_name,
                 "test": test_case['name'],
@@ -357,12 +505,11 @@ class MCPTestRunner:
 
     async def run_all_tests(self):
         """Run all test cases for available tools."""
-        total_tests = 0
-
-        # Count total tests
-        for tool_name, test_cases in self.test_cases.items():
-            if tool_name in self.available_tools:
-                total_tests += len(test_cases)
+        # Execution plan: (tool, test case) pairs for the tools the server exposes
+        plan = [(tool_name, test_case)
+                for tool_name, test_cases in self.test_cases.items() if tool_name in self.available_tools_set
+                for test_case in test_cases]
+        total_tests = len(plan)
 
         if total_tests == 0:
             print("✗ No tests to run (no matching tools)")
@@ -371,49 +518,64 @@ class MCPTestRunner:
         print(f"\nRunning {total_tests} test cases...")
         print("─" * 60)  # Add separator before tests start
 
-        for tool_name, test_cases in self.test_cases.items():
-            if tool_name not in self.available_tools:
-                continue
+        # Calls share one MCP session; the semaphore bounds how many are in flight at once
+        semaphore = asyncio.Semaphore(self.concurrency)
 
-            for test_case in test_cases:
-                result = await self.run_test_case(tool_name, test_case)
-                self.results.append(result)
+        async def run_bounded(tool_name: str, test_case: dict) -> dict:
+            async with semaphore:
+                return await self.run_test_case(tool_name, test_case)
+
+        # gather keeps the results in test case order
+        self.results.extend(await asyncio.gather(*(run_bounded(tool_name, test_case)
+                                                   for tool_name, test_case in plan)))
 
         # Add separator after tests complete to separate from any server output
         print("\n" + "─" * 60)
         print("Tests completed")
 
-    def generate_report(self):
+    async def generate_report(self):
         """Generate and print test report."""
         if not self.results:
             print("\nNo test results to report")
             return
 
+        # Tally everything in one pass over the results
+        passed = 0
+        total_time = 0.0
+        failures: list[dict] = []
+        warning_results: list[dict] = []
+        for result in self.results:
+            total_time += result['duration']
+            if result['status'] == 'PASS':
+                passed += 1
+            elif result['status'] == 'FAIL':
+                failures.append(result)
+            if result.get('has_warning', False):
+                warning_results.append(result)
+        failed = len(failures)
+        warnings = len(warning_results)
+
         # Failed details
-        failed = len([r for r in self.results if r['status'] == 'FAIL'])
         if failed > 0:
             print("\n" + "="*80)
             print("FAILURE DETAILS")
             print("="*80)
-            for result in self.results:
-                if result['status'] == 'FAIL':
-                    print(f"  ✗ {result['tool']}:{result['test']} - FAIL")
-                    print(f"    Error: {result['error'].split('\n')[0]}")
+            for result in failures:
+                print(f"  ✗ {result['tool']}:{result['test']} - FAIL")
+                first_line = result['error'].split('\n')[0]
+                print(f"    Error: {first_line}")
 
-                    print()  # Add blank line between failures for readability
+                print()  # Add blank line between failures for readability
 
         # Warning details
-        warnings = len([r for r in self.results if r.get('has_warning', False)])
         if warnings > 0:
             print("\n" + "="*80)
             print("WARNING DETAILS")
             print("="*80)
-            for result in self.results:
-                if result.get('has_warning', False):
-                    print(f"  ⚠ {result['tool']}:{result['test']} - Empty result set\n")
+            for result in warning_results:
+                print(f"  ⚠ {result['tool']}:{result['test']} - Empty result set\n")
 
         # Performance summary
-        total_time = sum(r['duration'] for r in self.results)
         avg_time = total_time / len(self.results) if self.results else 0
         print("\n" + "="*80)
         print("PERFORMANCE")
@@ -423,7 +585,6 @@ class MCPTestRunner:
 
         # Test report summary at the very end
         total = len(self.results)
-        passed = len([r for r in self.results if r['status'] == 'PASS'])
         print("\n" + "="*80)
         print("TEST REPORT")
         print("="*80)
@@ -434,10 +595,10 @@ class MCPTestRunner:
         print(f"Success Rate: {passed/total*100:.1f}%")
 
         # Save detailed results
-        self.save_results()
+        await self.save_results({"total": total, "passed": passed, "failed": failed, "warnings": warnings})
 
-    def save_results(self):
-        """Save detailed results to JSON file."""
+    async def save_results(self, summary: dict):
+        """Save detailed results and the report summary to JSON file."""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
         # Ensure var/test-reports directory exists
@@ -448,17 +609,12 @@ class MCPTestRunner:
 
         detailed_results = {
             "timestamp": datetime.now().isoformat(),
-            "summary": {
-                "total": len(self.results),
-                "passed": len([r for r in self.results if r['status'] == 'PASS']),
-                "failed": len([r for r in self.results if r['status'] == 'FAIL']),
-                "warnings": len([r for r in self.results if r.get('has_warning', False)])
-            },
+            "summary": summary,
             "results": self.results
         }
 
-        with open(results_file, 'w') as f:
-            json.dump(detailed_results, f, indent=2)
+        # Serialize and write in a worker thread so the event loop keeps draining server output
+        await asyncio.to_thread(write_report, results_file, detailed_results, self.pretty_report)
 
         print(f"Detailed results saved to: {results_file}")
 
@@ -474,33 +630,47 @@ class MCPTestRunner:
         self.exit_stack = None
 
 
-async def main():
-    """Main entry point."""
-    if len(sys.argv) < 2:
-        print("Usage: python tests/run_mcp_tests.py <server_command> [test_cases_file1] [test_cases_file2] [...] [--verbose]")
-        print("Examples:")
-        print("  python tests/run_mcp_tests.py 'uv run teradata-mcp-server'")
-        print("  python tests/run_mcp_tests.py 'uv run teradata-mcp-server' tests/cases/core_test_cases.json")
-        print("  python tests/run_mcp_tests.py 'uv run teradata-mcp-server' tests/cases/core_test_cases.json tests/cases/fs_test_cases.json")
-        print("  python tests/run_mcp_tests.py 'uv run teradata-mcp-server' tests/cases/evs_test_cases.json --verbose")
-        sys.exit(1)
-
-    server_command = sys.argv[1].split()
+def parse_args() -> argparse.Namespace:
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(
+        description="Run MCP server test cases",
+        epilog="Examples:\n"
+               "  python tests/run_mcp_tests.py 'uv run teradata-mcp-server'\n"
+               "  python tests/run_mcp_tests.py 'uv run teradata-mcp-server' tests/cases/core_test_cases.json\n"
+               "  python tests/run_mcp_tests.py 'uv run teradata-mcp-server' tests/cases/core_test_cases.json tests/cases/fs_test_cases.json\n"
+               "  python tests/run_mcp_tests.py 'uv run teradata-mcp-server' tests/cases/evs_test_cases.json --verbose",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("server_command", help="Command that starts the MCP server")
+    parser.add_argument("test_cases_files", nargs="*", default=["tests/cases/core_test_cases.json"],
+                        help="Test case files (default: tests/cases/core_test_cases.json)")
+    parser.add_argument("--verbose", action="store_true", help="Show full responses for failures and server logs")
+    parser.add_argument("--concurrency", type=int, default=1,
+                        help="Number of test cases run at the same time (default: 1, sequential)")
+    parser.add_argument("--cache-idempotent", action="store_true",
+                        help="Reuse passing results of cases marked \"idempotent\" that repeat a tool call")
+    parser.add_argument("--stream-parse", action="store_true",
+                        help="Scan tool responses with ijson instead of loading them whole (requires ijson)")
+    parser.add_argument("--pretty-report", action="store_true",
+                        help="Indent the JSON test report (default: compact)")
+    return parser.parse_args()
 
-    # Parse test case files from arguments
-    test_cases_files = []
-    verbose = "--verbose" in sys.argv
 
-    # Check for test case file arguments (anything that doesn't start with --)
-    for i in range(2, len(sys.argv)):
-        if not sys.argv[i].startswith('--'):
-            test_cases_files.append(sys.argv[i])
-
-    # Default to core test cases if no files specified
-    if not test_cases_files:
-        test_cases_files = ["tests/cases/core_test_cases.json"]
-
-    runner = MCPTestRunner(test_cases_files, verbose)
+async def main():
+    """Main entry point."""
+    args = parse_args()
+    server_command = args.server_command.split()
+    test_cases_files = args.test_cases_files
+    verbose = args.verbose
+
+    runner = MCPTestRunner(
+        test_cases_files,
+        verbose,
+        concurrency=args.concurrency,
+        cache_idempotent=args.cache_idempotent,
+        stream_parse=args.stream_parse,
+        pretty_report=args.pretty_report,
+    )
 
     try:
         await runner.load_test_cases()
@@ -508,7 +678,7 @@ async def main():
         await runner.connect_to_server(server_command)
         await runner.discover_tools()
         await runner.run_all_tests()
-        runner.generate_report()
+        await runner.generate_report()
 
         # Give a moment for any remaining server output, then label it
         await asyncio.sleep(0.1)
@@ -523,4 +693,9 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # Run on uvloop when it is installed, otherwise on asyncio
+    try:
+        from uvloop import run as run_loop
+    except ImportError:
+        from asyncio import run as run_loop
+    run_loop(main())